@@ -0,0 +1,135 @@
+"""
+Group allocation strategies.
+
+A strategy decides which of a product's groups with free places a new
+student is added to. Each strategy is described as an ordering over the
+candidate groups, so the same definition drives both the ORM query used
+by the ``distribute_user_to_group`` signal and the in-memory model used
+by the ``simulate_allocation`` management command.
+"""
+from django.conf import settings
+
+
+DEFAULT_STRATEGY = 'least_filled'
+
+STRATEGIES = {
+    'least_filled': ('count', 'id'),
+    'most_filled': ('-count', 'id'),
+    'first_fit': ('id',),
+}
+
+
+def get_strategy(name=None):
+    """
+    Returns the ordering of the allocation strategy with the given name.
+
+    Args:
+        name (str): The name of the strategy. When omitted, the
+            GROUP_ALLOCATION_STRATEGY setting is used.
+
+    Returns:
+        tuple: The ordering of candidate groups, in ``order_by`` notation.
+
+    Raises:
+        ValueError: If the strategy is unknown.
+    """
+    if name is None:
+        name = getattr(settings, 'GROUP_ALLOCATION_STRATEGY', DEFAULT_STRATEGY)
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown group allocation strategy: {name!r}. "
+            f"Choices are: {', '.join(sorted(STRATEGIES))}."
+        )
+
+
+def capacity_violations(sizes, min_users_in_group, max_users_in_group):
+    """
+    Counts the groups whose size is outside the product's limits.
+
+    Args:
+        sizes (list): The number of users in every group.
+        min_users_in_group (int): The minimum number of users in a group.
+        max_users_in_group (int): The maximum number of users in a group.
+
+    Returns:
+        tuple: The number of groups over the maximum and under the minimum.
+    """
+    over = sum(1 for size in sizes if size > max_users_in_group)
+    under = sum(1 for size in sizes if size < min_users_in_group)
+    return over, under
+
+
+class InMemoryAllocator:
+    """
+    An in-memory model of the groups of a single product.
+
+    Attributes:
+        strategy (str): The name of the allocation strategy.
+        min_users_in_group (int): The minimum number of users in a group.
+        max_users_in_group (int): The maximum number of users in a group.
+        groups (dict): The users of every group, keyed by group id.
+    """
+
+    def __init__(self, strategy, min_users_in_group, max_users_in_group):
+        self.strategy = strategy
+        self.ordering = get_strategy(strategy)
+        self.min_users_in_group = min_users_in_group
+        self.max_users_in_group = max_users_in_group
+        self.groups = {}
+
+    def _sort_key(self, group_id):
+        values = {'id': group_id, 'count': len(self.groups[group_id])}
+        return tuple(
+            -values[field[1:]] if field.startswith('-') else values[field]
+            for field in self.ordering
+        )
+
+    def add_user(self, user):
+        """
+        Adds the user to a group, creating a new group if all are full.
+
+        Args:
+            user (int): The id of the user.
+
+        Returns:
+            int: The id of the group that the user was added to.
+        """
+        candidates = [
+            group_id for group_id, users in self.groups.items()
+            if len(users) < self.max_users_in_group
+        ]
+        if candidates:
+            group_id = min(candidates, key=self._sort_key)
+        else:
+            group_id = len(self.groups) + 1
+            self.groups[group_id] = set()
+        self.groups[group_id].add(user)
+        return group_id
+
+    def remove_user(self, user):
+        """
+        Removes the user from every group they are a member of.
+
+        Args:
+            user (int): The id of the user.
+        """
+        for users in self.groups.values():
+            users.discard(user)
+
+    def group_sizes(self):
+        """
+        Returns the number of users in every group, ordered by group id.
+        """
+        return [len(self.groups[group_id]) for group_id in sorted(self.groups)]
+
+    def capacity_violations(self):
+        """
+        Returns the number of groups over the maximum and under the minimum.
+        """
+        return capacity_violations(
+            self.group_sizes(),
+            self.min_users_in_group,
+            self.max_users_in_group
+        )
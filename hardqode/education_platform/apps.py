@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EducationPlatformConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'education_platform'
+
+    def ready(self):
+        from . import checks  # noqa: F401
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+from .allocation import DEFAULT_STRATEGY, STRATEGIES
+
+
+@register()
+def check_group_allocation_strategy(app_configs, **kwargs):
+    """
+    Checks that the GROUP_ALLOCATION_STRATEGY setting names a known strategy.
+    """
+    strategy = getattr(settings, 'GROUP_ALLOCATION_STRATEGY', DEFAULT_STRATEGY)
+    if strategy in STRATEGIES:
+        return []
+    return [
+        Error(
+            f"Unknown group allocation strategy: {strategy!r}.",
+            hint=f"Choices are: {', '.join(sorted(STRATEGIES))}.",
+            obj='GROUP_ALLOCATION_STRATEGY',
+            id='education_platform.E001',
+        )
+    ]
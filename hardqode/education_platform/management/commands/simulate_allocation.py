@@ -0,0 +1,317 @@
+import csv
+import random
+import time
+import uuid
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from education_platform.allocation import (
+    InMemoryAllocator,
+    STRATEGIES,
+    capacity_violations
+)
+from education_platform.models import Access, Product
+
+PURCHASE = 'purchase'
+LEAVE = 'leave'
+BACKENDS = ('memory', 'orm')
+
+
+class QueryCounter:
+    """
+    A database execute wrapper that counts the executed queries.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    """
+    Replays a stream of purchases and leaves against group allocation
+    strategies and reports throughput and the resulting groups.
+
+    The ORM backend runs the real ``distribute_user_to_group`` signal
+    inside a transaction on the default database that is rolled back.
+    No rows are kept, but the database is locked for the whole replay
+    and auto-increment counters still advance.
+    """
+    help = (
+        'Replays a synthetic or recorded stream of purchases and leaves '
+        'against group allocation strategies. The ORM backend writes to '
+        'the default database inside a transaction that is rolled back: '
+        'it locks the database for the whole replay and advances '
+        'auto-increment counters, so do not run it against a live database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--strategy',
+            nargs='+',
+            choices=sorted(STRATEGIES),
+            default=sorted(STRATEGIES),
+            help='Allocation strategies to compare. Defaults to all.'
+        )
+        parser.add_argument(
+            '--backend',
+            choices=BACKENDS + ('both',),
+            default='both',
+            help='Run against the in-memory model, the ORM, or both.'
+        )
+        parser.add_argument(
+            '--input',
+            help=(
+                'CSV file of recorded events, one "purchase,<user>" or '
+                '"leave,<user>" per line. Overrides the synthetic stream.'
+            )
+        )
+        parser.add_argument(
+            '--events',
+            type=int,
+            default=1000,
+            help='Number of synthetic events to generate.'
+        )
+        parser.add_argument(
+            '--leave-ratio',
+            type=float,
+            default=0.1,
+            help='Share of synthetic events that are leaves.'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed of the synthetic stream.'
+        )
+        parser.add_argument(
+            '--min-users',
+            type=int,
+            default=Product._meta.get_field('min_users_in_group').default,
+            help='Minimum number of users in a group.'
+        )
+        parser.add_argument(
+            '--max-users',
+            type=int,
+            default=Product._meta.get_field('max_users_in_group').default,
+            help='Maximum number of users in a group.'
+        )
+
+    def handle(self, *args, **options):
+        if options['max_users'] < 1:
+            raise CommandError('--max-users must be at least 1.')
+        if options['input']:
+            events = self.read_events(options['input'])
+        else:
+            events = self.generate_events(
+                options['events'],
+                options['leave_ratio'],
+                options['seed']
+            )
+        backends = (
+            BACKENDS if options['backend'] == 'both'
+            else (options['backend'],)
+        )
+        for strategy in options['strategy']:
+            for backend in backends:
+                run = getattr(self, f'run_{backend}')
+                result = run(
+                    events,
+                    strategy,
+                    options['min_users'],
+                    options['max_users']
+                )
+                self.report(strategy, backend, events, result)
+
+    def generate_events(self, count, leave_ratio, seed):
+        """
+        Generates a synthetic stream of events.
+
+        Every purchase is made by a new user, every leave by a random user
+        who currently has access.
+
+        Returns:
+            list: (action, user) tuples.
+        """
+        rng = random.Random(seed)
+        events = []
+        active = []
+        for user in range(1, count + 1):
+            if active and rng.random() < leave_ratio:
+                leaving = active.pop(rng.randrange(len(active)))
+                events.append((LEAVE, leaving))
+            else:
+                active.append(user)
+                events.append((PURCHASE, user))
+        return events
+
+    def read_events(self, path):
+        """
+        Reads a recorded stream of events from a CSV file.
+
+        Returns:
+            list: (action, user) tuples.
+        """
+        events = []
+        try:
+            with open(path, newline='') as stream:
+                for line, row in enumerate(csv.reader(stream), start=1):
+                    if not row:
+                        continue
+                    try:
+                        action, user = row[0].strip(), int(row[1])
+                    except (IndexError, ValueError):
+                        raise CommandError(f'{path}:{line}: malformed event.')
+                    if action not in (PURCHASE, LEAVE):
+                        raise CommandError(
+                            f'{path}:{line}: unknown action {action!r}.'
+                        )
+                    events.append((action, user))
+        except OSError as error:
+            raise CommandError(error)
+        return events
+
+    def run_memory(self, events, strategy, min_users, max_users):
+        """
+        Replays the events against the in-memory model.
+
+        Returns:
+            dict: The replay statistics, see ``report``.
+        """
+        allocator = InMemoryAllocator(strategy, min_users, max_users)
+        allocation_time = 0
+        start = time.perf_counter()
+        for action, user in events:
+            if action == PURCHASE:
+                allocation_start = time.perf_counter()
+                allocator.add_user(user)
+                allocation_time += time.perf_counter() - allocation_start
+            else:
+                allocator.remove_user(user)
+        elapsed = time.perf_counter() - start
+        return {
+            'elapsed': elapsed,
+            'allocation_time': allocation_time,
+            'queries': 0,
+            'allocation_queries': 0,
+            'sizes': allocator.group_sizes(),
+            'violations': allocator.capacity_violations(),
+        }
+
+    def run_orm(self, events, strategy, min_users, max_users):
+        """
+        Replays the events through the Access model and its signals.
+
+        Returns:
+            dict: The replay statistics, see ``report``.
+        """
+        prefix = f'simulate_allocation_{uuid.uuid4().hex[:8]}'
+        with transaction.atomic():
+            creator = User.objects.create(username=prefix)
+            product = Product.objects.create(
+                name=f'Allocation simulation ({strategy})',
+                start_datetime=timezone.now(),
+                cost=0,
+                creator=creator,
+                min_users_in_group=min_users,
+                max_users_in_group=max_users
+            )
+            user_ids = sorted({user for _, user in events})
+            users = dict(zip(user_ids, User.objects.bulk_create(
+                User(username=f'{prefix}_{user}') for user in user_ids
+            )))
+            counter = QueryCounter()
+            allocation_time = 0
+            allocation_queries = 0
+            with override_settings(GROUP_ALLOCATION_STRATEGY=strategy), \
+                    connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                for action, user in events:
+                    if action == PURCHASE:
+                        allocation_start = time.perf_counter()
+                        queries_before = counter.count
+                        Access.objects.create(
+                            user=users[user],
+                            product=product
+                        )
+                        allocation_time += (
+                            time.perf_counter() - allocation_start
+                        )
+                        allocation_queries += counter.count - queries_before
+                    else:
+                        Access.objects.filter(
+                            user=users[user],
+                            product=product
+                        ).delete()
+                elapsed = time.perf_counter() - start
+            sizes = list(
+                product.groups.annotate(count=Count('users'))
+                .order_by('id')
+                .values_list('count', flat=True)
+            )
+            transaction.set_rollback(True)
+        return {
+            'elapsed': elapsed,
+            'allocation_time': allocation_time,
+            'queries': counter.count,
+            'allocation_queries': allocation_queries,
+            'sizes': sizes,
+            'violations': capacity_violations(sizes, min_users, max_users),
+        }
+
+    def report(self, strategy, backend, events, result):
+        """
+        Writes the statistics of a replay.
+
+        The result holds the elapsed seconds and query count of the whole
+        replay, the seconds and queries spent on purchases alone, the
+        final group sizes and the (over, under) capacity violations.
+        """
+        sizes = result['sizes']
+        over, under = result['violations']
+        queries = result['queries']
+        purchases = sum(1 for action, _ in events if action == PURCHASE)
+        allocation_time = result['allocation_time']
+        rate = purchases / allocation_time if allocation_time else 0
+        distribution = ', '.join(
+            f'{size}: {groups}'
+            for size, groups in sorted(Counter(sizes).items())
+        )
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{strategy} / {backend}'
+        ))
+        self.stdout.write(
+            f'  events:              {len(events)} '
+            f'({purchases} purchases, {len(events) - purchases} leaves)'
+        )
+        self.stdout.write(
+            f'  elapsed:             {result["elapsed"]:.3f}s'
+        )
+        self.stdout.write(f'  allocations/sec:     {rate:.1f}')
+        self.stdout.write(
+            f'  queries:             {queries} '
+            f'({queries / len(events) if events else 0:.2f} per event)'
+        )
+        allocation_queries = (
+            result['allocation_queries'] / purchases if purchases else 0
+        )
+        self.stdout.write(
+            f'  queries/allocation:  {allocation_queries:.2f}'
+        )
+        self.stdout.write(f'  groups created:      {len(sizes)}')
+        self.stdout.write(f'  group sizes:         {distribution or "-"}')
+        violations = (
+            f'  capacity violations: {over} over max, {under} under min'
+        )
+        self.stdout.write(
+            self.style.WARNING(violations) if over or under else violations
+        )
@@ -1,9 +1,11 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models import Count, F
-from django.db.models.signals import post_save
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from .allocation import get_strategy
+
 
 class Product(models.Model):
     """
@@ -120,16 +122,35 @@ def distribute_user_to_group(sender, instance, created, **kwargs):
         product = instance.product
         user = instance.user
         group = product.groups.annotate(count=Count('users')).filter(
-            count__lt=F('max_users')).order_by('count').first()
+            count__lt=product.max_users_in_group
+        ).order_by(*get_strategy()).first()
         if group:
             group.users.add(user)
             return group
         else:
             new_group = Group.objects.create(
                 name=f"New group for {product.name}",
-                product=product,
-                min_users=1,
-                max_users=10
+                product=product
             )
             new_group.users.add(user)
             return new_group
+
+
+"""
+This function is triggered when an Access object is deleted.
+It removes the user from the groups of the product they no longer
+have access to.
+
+Args:
+    sender (Model): The model class that triggered the signal.
+    instance (Model): The deleted Access object.
+    **kwargs (dict): Any additional keyword arguments.
+"""
+
+
+@receiver(post_delete, sender=Access)
+def remove_user_from_group(sender, instance, **kwargs):
+    Group.users.through.objects.filter(
+        group__product_id=instance.product_id,
+        user_id=instance.user_id
+    ).delete()
@@ -0,0 +1,142 @@
+from django.contrib.auth.models import User
+from django.core.checks import run_checks
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .allocation import STRATEGIES, InMemoryAllocator
+from .management.commands.simulate_allocation import LEAVE, PURCHASE, Command
+from .models import Access, Group, Product
+
+
+class AllocationTestCase(TestCase):
+    """
+    Base test case that creates a product and a factory for students.
+    """
+
+    def setUp(self):
+        self.creator = User.objects.create(username='creator')
+        self.product = self.create_product('Python', max_users_in_group=3)
+
+    def create_product(self, name, **kwargs):
+        return Product.objects.create(
+            name=name,
+            start_datetime=timezone.now(),
+            cost=100,
+            creator=self.creator,
+            **kwargs
+        )
+
+    def create_users(self, count, prefix='student'):
+        return [
+            User.objects.create(username=f'{prefix}_{number}')
+            for number in range(count)
+        ]
+
+
+class DistributeUserToGroupTests(AllocationTestCase):
+
+    def test_purchase_adds_user_to_group(self):
+        user, = self.create_users(1)
+        Access.objects.create(user=user, product=self.product)
+        group, = self.product.groups.all()
+        self.assertEqual(list(group.users.all()), [user])
+
+    def test_new_group_is_created_when_groups_are_full(self):
+        for user in self.create_users(4):
+            Access.objects.create(user=user, product=self.product)
+        sizes = [group.users.count() for group in self.product.groups.all()]
+        self.assertEqual(sorted(sizes), [1, 3])
+
+
+class RemoveUserFromGroupTests(AllocationTestCase):
+
+    def test_leave_removes_user_only_from_product_groups(self):
+        other_product = self.create_product('Go')
+        user, classmate = self.create_users(2)
+        for product in (self.product, other_product):
+            Access.objects.create(user=user, product=product)
+            Access.objects.create(user=classmate, product=product)
+
+        Access.objects.filter(user=user, product=self.product).delete()
+
+        group = self.product.groups.get()
+        other_group = other_product.groups.get()
+        self.assertEqual(list(group.users.all()), [classmate])
+        self.assertEqual(
+            set(other_group.users.all()),
+            {user, classmate}
+        )
+
+
+class StrategyTests(AllocationTestCase):
+    """
+    Every strategy picks a group from the same set of groups:
+    the first with 1 user, the second with 2 and the third empty.
+    """
+    sizes = [1, 2, 0]
+    expected = {
+        'least_filled': 2,
+        'most_filled': 1,
+        'first_fit': 0,
+    }
+
+    def test_expected_strategies_are_covered(self):
+        self.assertEqual(set(self.expected), set(STRATEGIES))
+
+    def test_orm_strategies(self):
+        users = iter(self.create_users(sum(self.sizes) + 1))
+        groups = []
+        for size in self.sizes:
+            group = Group.objects.create(name='Group', product=self.product)
+            group.users.add(*(next(users) for _ in range(size)))
+            groups.append(group)
+        newcomer = next(users)
+
+        for strategy, index in self.expected.items():
+            with self.subTest(strategy=strategy), \
+                    override_settings(GROUP_ALLOCATION_STRATEGY=strategy):
+                access = Access.objects.create(
+                    user=newcomer,
+                    product=self.product
+                )
+                self.assertEqual(
+                    list(newcomer.user_groups.all()),
+                    [groups[index]]
+                )
+                access.delete()
+
+    def test_in_memory_strategies(self):
+        for strategy, index in self.expected.items():
+            with self.subTest(strategy=strategy):
+                allocator = InMemoryAllocator(strategy, 1, 3)
+                allocator.groups = {
+                    group_id: {f'{group_id}_{user}' for user in range(size)}
+                    for group_id, size in enumerate(self.sizes, start=1)
+                }
+                self.assertEqual(allocator.add_user('newcomer'), index + 1)
+
+
+class SimulateAllocationTests(TestCase):
+
+    def test_backends_agree(self):
+        command = Command()
+        events = command.generate_events(60, 0.3, seed=1)
+        self.assertIn(LEAVE, {action for action, _ in events})
+        self.assertIn(PURCHASE, {action for action, _ in events})
+        for strategy in STRATEGIES:
+            with self.subTest(strategy=strategy):
+                memory = command.run_memory(events, strategy, 2, 4)
+                orm = command.run_orm(events, strategy, 2, 4)
+                self.assertEqual(memory['sizes'], orm['sizes'])
+                self.assertEqual(memory['violations'], orm['violations'])
+
+
+class GroupAllocationStrategyCheckTests(TestCase):
+
+    @override_settings(GROUP_ALLOCATION_STRATEGY='unknown')
+    def test_unknown_strategy_is_reported(self):
+        errors = run_checks()
+        self.assertIn(
+            'education_platform.E001',
+            [error.id for error in errors]
+        )
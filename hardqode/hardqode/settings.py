@@ -123,3 +123,8 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Strategy used to distribute students to groups on purchase:
+# 'least_filled', 'most_filled' or 'first_fit'
+
+GROUP_ALLOCATION_STRATEGY = 'least_filled'